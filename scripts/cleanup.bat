@@ -21,21 +21,27 @@ echo === %~1 ===
 echo.
 goto :eof
 
-REM Function to kill processes by image name
+REM Function to kill processes by image names in a single taskkill call
 :kill_by_name
 setlocal
-set IMAGE_NAME=%~1
-set SIGNAL=%~2
-if "%SIGNAL%"=="" set SIGNAL=/F
-
-call :print_section "Killing %IMAGE_NAME% processes"
-
-echo Using taskkill for %IMAGE_NAME%...
-taskkill %SIGNAL% /IM "%IMAGE_NAME%" /T >nul 2>&1
+set IMAGE_ARGS=
+set IMAGE_NAMES=
+:kill_by_name_args
+if "%~1"=="" goto kill_by_name_run
+set IMAGE_ARGS=%IMAGE_ARGS% /IM "%~1"
+set IMAGE_NAMES=%IMAGE_NAMES% %~1
+shift
+goto kill_by_name_args
+
+:kill_by_name_run
+call :print_section "Killing%IMAGE_NAMES% processes"
+
+echo Using taskkill for%IMAGE_NAMES%...
+taskkill /F /T%IMAGE_ARGS% >nul 2>&1
 if %errorlevel% equ 0 (
-    echo   ✓ taskkill successful for %IMAGE_NAME%
+    echo   ✓ taskkill successful for%IMAGE_NAMES%
 ) else (
-    echo   No %IMAGE_NAME% processes found
+    echo   No%IMAGE_NAMES% processes found
 )
 
 endlocal
@@ -126,12 +132,8 @@ echo.
 REM List processes before cleanup
 call :list_chrome_processes
 
-REM Kill processes by name
-call :kill_by_name "chrome.exe"
-call :kill_by_name "chromium.exe"
-call :kill_by_name "chromedriver.exe"
-call :kill_by_name "chrome.dll"
-call :kill_by_name "chromedriver.dll"
+REM Kill processes by name with a single taskkill call
+call :kill_by_name "chrome.exe" "chromium.exe" "chromedriver.exe"
 
 REM Kill processes on common Chrome ports
 call :kill_by_port 9222  REM Chrome DevTools
@@ -0,0 +1,16 @@
+import logging
+import os
+from functools import cache
+
+import load_env
+
+
+@cache
+def bootstrap():
+    # Both entry points call this; the .env parse and logging setup only
+    # need to happen once per process
+    load_env.load()
+    logging.basicConfig(
+        level=logging.DEBUG if os.getenv("LOG_LEVEL") == "DEBUG" else logging.INFO,
+        format="\n%(name)s → %(levelname)s: %(message)s\n",
+    )
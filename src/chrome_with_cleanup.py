@@ -26,6 +26,14 @@ class ChromeWithFullCleanup:
                 return
 
             self.driver.close()
+
+            # Close tabs or popups the run left behind so long-running sessions
+            # keep a single window open
+            for handle in self.driver.window_handles:
+                if handle != self.original_window_handle:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+
             self.driver.switch_to.window(self.original_window_handle)
         except Exception as error:
             self.logger.error("Failed to close Chrome window: %s", error)
@@ -1,10 +1,22 @@
+from __future__ import annotations
+
 import asyncio
+import base64
+import gzip
 import os
 import random
 import re
 from datetime import date, datetime
-from logging import Logger
-
+from functools import cache
+from logging import DEBUG, Logger
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any, Coroutine
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
@@ -13,8 +25,165 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
 from chrome_with_cleanup import ChromeWithFullCleanup
+from init_chromium import block_trackers
 from run_outcome import RunOutcome
 
+if TYPE_CHECKING:
+    import telegram
+
+_notification_loop: asyncio.AbstractEventLoop | None = None
+_notification_loop_lock = Lock()
+_bots: dict[str, telegram.Bot] = {}
+
+_FIRST_STEP_INPUT_IDS = (
+    "Persons[0][first_name]",
+    "Persons[0][last_name]",
+    "e_mail",
+    "e_mail_repeat",
+    "phone",
+)
+_FIRST_STEP_SUBMIT_WRAPPER_ID = "step1-next-btn"
+
+# Resolves every first step input and the submit button in one round-trip.
+_FIRST_STEP_ELEMENTS_SCRIPT = """
+const [form, inputIds, submitWrapperId] = arguments;
+const find = (id) => form.querySelector(`[id="${id}"]`);
+const submitWrapper = find(submitWrapperId);
+return [
+    ...inputIds.map(find),
+    submitWrapper && submitWrapper.querySelector("button"),
+];
+"""
+
+# Matches elements by CSS and filters them by whitespace-normalized text, which
+# CSS selectors cannot express, without a round-trip per candidate.
+_FIND_BY_TEXT_SCRIPT = """
+const [selector, texts] = arguments;
+return Array.from(document.querySelectorAll(selector)).filter(
+    (element) => texts.includes(element.textContent.replace(/\\s+/g, " ").trim())
+);
+"""
+
+# Scrolls the service description to the end and looks up its confirmation
+# checkbox and add button in one round-trip. The checkbox is clicked natively
+# afterwards: the page may only enable it once the scroll event has fired.
+_CONFIRM_DESCRIPTION_SCRIPT = """
+const description = arguments[0];
+description.scrollTo(0, description.scrollHeight);
+return [
+    description.querySelector(".form-checkbox"),
+    description.querySelector(".description-button"),
+];
+"""
+
+# Focuses an input and selects its current value, so the text inserted next
+# replaces it.
+_FOCUS_AND_SELECT_SCRIPT = """
+const input = arguments[0];
+input.focus();
+input.select();
+"""
+
+# Searches the calendar month by month in one async round-trip: collects the
+# active cells, stops at the first one inside the preferred range (ISO dates
+# compare correctly as strings), otherwise clicks "next month" and resumes from
+# a MutationObserver as soon as the grid re-renders.
+_FIND_DATE_SCRIPT = """
+const [lo, hi, maxMonths, done] = arguments;
+const available = [];
+
+const gridSignature = () => {
+    const cell = document.querySelector("#calendar-daygrid td[data-date]");
+    return cell && cell.getAttribute("data-date");
+};
+
+const finish = (chosen, chosenDate, months, timedOut) => done({
+    chosen: chosen,
+    chosenDate: chosenDate,
+    available: available,
+    months: months,
+    timedOut: timedOut,
+});
+
+const searchMonth = (monthIndex) => {
+    const grid = document.getElementById("calendar-daygrid");
+    for (const cell of grid.querySelectorAll("td[class*='cal-active']")) {
+        const cellDate = cell.getAttribute("data-date");
+        if (!cellDate) {
+            continue;
+        }
+        available.push(cellDate);
+        if (cellDate >= lo && cellDate <= hi) {
+            finish(cell, cellDate, monthIndex + 1, false);
+            return;
+        }
+    }
+
+    if (monthIndex + 1 >= maxMonths) {
+        finish(null, null, monthIndex + 1, false);
+        return;
+    }
+
+    const previous = gridSignature();
+    const observer = new MutationObserver(() => {
+        // A grid that is empty or swapped out mid-render is not the next
+        // month yet; keep waiting until it has dated cells again
+        const signature = gridSignature();
+        if (
+            signature &&
+            signature !== previous &&
+            document.getElementById("calendar-daygrid")
+        ) {
+            observer.disconnect();
+            clearTimeout(timer);
+            searchMonth(monthIndex + 1);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        finish(null, null, monthIndex + 1, true);
+    }, 10000);
+
+    observer.observe(document.body, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        attributeFilter: ["data-date"],
+    });
+    document.querySelector(".calendar-next").click();
+};
+
+searchMonth(0);
+"""
+
+
+def _wait(driver: WebDriver | WebElement, timeout: float = 10) -> WebDriverWait:
+    # Poll well below the 0.5s default so ready elements are picked up quickly
+    return WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=0.05,
+        ignored_exceptions=(StaleElementReferenceException,),
+    )
+
+
+def _find_by_text(
+    driver: WebDriver, selector: str, texts: tuple[str, ...]
+) -> list[WebElement]:
+    return driver.execute_script(_FIND_BY_TEXT_SCRIPT, selector, list(texts))
+
+
+def _insert_text(driver: WebDriver, element: WebElement, value: str):
+    # Input.insertText delivers the whole value as one trusted input event;
+    # change still fires when the field loses focus
+    driver.execute_script(_FOCUS_AND_SELECT_SCRIPT, element)
+    driver.execute_cdp_cmd("Input.insertText", {"text": value})
+
+
+def _click(driver: WebDriver, element: WebElement, timeout: float = 10):
+    _wait(driver, timeout).until(expected_conditions.element_to_be_clickable(element))
+    driver.execute_script("arguments[0].click();", element)
+
 
 def process(logger: Logger, driver: WebDriver) -> RunOutcome:
     cleanup = ChromeWithFullCleanup(
@@ -24,8 +193,10 @@ def process(logger: Logger, driver: WebDriver) -> RunOutcome:
     with cleanup as local_driver:
         try:
             local_driver.switch_to.new_window("tab")
+            block_trackers(local_driver)
             local_driver.get("https://pieraksts.mfa.gov.lv/en/moscow/index")
-            logger.info(f"Page was open: {local_driver.title}")
+            if logger.isEnabledFor(DEBUG):
+                logger.debug(f"Page was open: {local_driver.title}")
             make_first_step(local_driver, logger)
             make_second_step(local_driver, logger)
             if make_third_step(local_driver, logger):
@@ -34,8 +205,6 @@ def process(logger: Logger, driver: WebDriver) -> RunOutcome:
                     cleanup.keep_current_window = True
                 return outcome
             return RunOutcome.NO_SLOT
-        except Exception as e:
-            raise e
         finally:
             logger.info("Quit")
 
@@ -44,39 +213,32 @@ def process(logger: Logger, driver: WebDriver) -> RunOutcome:
 
 
 def make_first_step(driver: WebDriver, logger: Logger):
-    form = WebDriverWait(driver, 10).until(
+    form = _wait(driver).until(
         expected_conditions.presence_of_element_located((By.TAG_NAME, "form"))
     )
 
-    name_input = form.find_element(By.ID, "Persons[0][first_name]")
-
-    logger.info(f"name input discovered: {name_input.get_dom_attribute('id')}")
-
-    surname_input = form.find_element(By.ID, "Persons[0][last_name]")
-
-    logger.info(f"surname input discovered: {surname_input.get_dom_attribute('id')}")
-
-    email_input = form.find_element(By.ID, "e_mail")
-
-    logger.info(f"email input discovered: {email_input.get_dom_attribute('id')}")
-
-    email_repeat_input = form.find_element(By.ID, "e_mail_repeat")
-
-    logger.info(
-        f"email repeat input discovered: {email_repeat_input.get_dom_attribute('id')}"
+    elements = driver.execute_script(
+        _FIRST_STEP_ELEMENTS_SCRIPT,
+        form,
+        list(_FIRST_STEP_INPUT_IDS),
+        _FIRST_STEP_SUBMIT_WRAPPER_ID,
     )
+    labels = (*_FIRST_STEP_INPUT_IDS, f"{_FIRST_STEP_SUBMIT_WRAPPER_ID} button")
+    missing = [name for name, element in zip(labels, elements) if element is None]
 
-    phone_input = form.find_element(By.ID, "phone")
+    if missing:
+        raise NoSuchElementException(f"First step elements not found: {missing}")
 
-    logger.info(f"phone input discovered: {phone_input.get_dom_attribute('id')}")
+    (
+        name_input,
+        surname_input,
+        email_input,
+        email_repeat_input,
+        phone_input,
+        first_step_submit_btn,
+    ) = elements
 
-    first_step_submit_btn = form.find_element(By.ID, "step1-next-btn").find_element(
-        By.TAG_NAME, "button"
-    )
-
-    logger.info(
-        f"first step submit button discovered: {first_step_submit_btn.get_dom_attribute('class')}"
-    )
+    logger.debug("First step form elements discovered")
 
     user_data = os.getenv("USER_FORM_DATA")
 
@@ -85,26 +247,23 @@ def make_first_step(driver: WebDriver, logger: Logger):
 
     name, surname, email, phone = user_data.split(",")
 
-    name_input.clear()
-    name_input.send_keys(name)
-
-    surname_input.clear()
-    surname_input.send_keys(surname)
+    for input_element, value in (
+        (name_input, name),
+        (surname_input, surname),
+        (email_input, email),
+        (email_repeat_input, email),
+        (phone_input, phone),
+    ):
+        _insert_text(driver, input_element, value)
 
-    email_input.clear()
-    email_input.send_keys(email)
+    # Focusing each next field blurs the previous one, which fires its change
+    # event; the script click on submit moves no focus, so blur the last field
+    driver.execute_script("arguments[0].blur();", phone_input)
 
-    email_repeat_input.clear()
-    email_repeat_input.send_keys(email)
-
-    phone_input.clear()
-    phone_input.send_keys(phone)
-
-    WebDriverWait(driver, 10).until(
-        expected_conditions.element_to_be_clickable(first_step_submit_btn)
-    ).click()
+    _click(driver, first_step_submit_btn)
 
-    logger.info(f"located to {driver.current_url}")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"located to {driver.current_url}")
 
 
 def make_second_step(driver: WebDriver, logger: Logger):
@@ -112,7 +271,7 @@ def make_second_step(driver: WebDriver, logger: Logger):
 
     actions = ActionChains(driver)
 
-    WebDriverWait(driver, 10).until(
+    _wait(driver).until(
         expected_conditions.presence_of_element_located((By.ID, "mfa-form2"))
     )
 
@@ -120,69 +279,66 @@ def make_second_step(driver: WebDriver, logger: Logger):
 
     logger.info("Second step form found")
 
-    select = second_step_form.find_element(
-        By.XPATH, '//div/div/section/div/div/p[text()="Select service"]'
-    )
+    select_candidates = _find_by_text(driver, "section p", ("Select service",))
 
-    logger.info(f"second step select discovered: {select.get_attribute('class')}")
+    if not select_candidates:
+        raise NoSuchElementException("Second step service select not found")
 
-    WebDriverWait(driver, 10).until(
-        expected_conditions.element_to_be_clickable(select)
-    ).click()
+    select = select_candidates[0]
+
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"second step select discovered: {select.get_attribute('class')}")
+
+    _click(driver, select)
 
-    visa_options = second_step_form.find_elements(
-        By.XPATH,
-        '//div/div/section/div/div[contains(@class, "services--wrapper")]/div/label[normalize-space(text())="Processing a visa" or normalize-space(text())="Processing a visa."]',
+    visa_options = _find_by_text(
+        driver,
+        ".services--wrapper > div > label",
+        ("Processing a visa", "Processing a visa."),
     )
 
     visa_option = random.choice(visa_options)
 
     actions.scroll_to_element(visa_option).perform()
 
-    logger.info(f"visa option discovered: {visa_option.text}")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"visa option discovered: {visa_option.text}")
 
-    WebDriverWait(driver, 10).until(
-        expected_conditions.element_to_be_clickable(visa_option)
-    ).click()
+    _click(driver, visa_option)
 
-    description = second_step_form.find_element(
-        By.XPATH,
-        '//div/div/section/div/div[contains(@class, "services--wrapper")]/section[@class="description active"]',
+    description = driver.find_element(
+        By.CSS_SELECTOR, ".services--wrapper > section.description.active"
     )
 
-    logger.info(
-        f"description element was discovered: {description.get_attribute('class')}"
-    )
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(
+            f"description element was discovered: {description.get_attribute('class')}"
+        )
 
-    driver.execute_script(
-        "arguments[0].scrollTo(0, arguments[0].scrollHeight);", description
+    confirmation, add_button = driver.execute_script(
+        _CONFIRM_DESCRIPTION_SCRIPT, description
     )
 
-    confirmation = description.find_element(By.CLASS_NAME, "form-checkbox")
+    if confirmation is None or add_button is None:
+        raise NoSuchElementException("Description confirmation or add button not found")
 
-    logger.info(f"confirmation check discovered: {confirmation.get_attribute('class')}")
-
-    actions.move_to_element(confirmation)
-
-    WebDriverWait(driver, 5).until(
+    # A native click lands on whatever is at the checkbox centre, which also
+    # toggles an input wrapped by .form-checkbox
+    _wait(driver, 5).until(
         expected_conditions.element_to_be_clickable(confirmation)
     ).click()
 
-    add_button = description.find_element(By.CLASS_NAME, "description-button")
-
-    logger.info(f"add button discovered: {add_button.text}")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"add button discovered: {add_button.text}")
 
-    WebDriverWait(driver, 10).until(
-        expected_conditions.element_to_be_clickable(add_button)
-    ).click()
+    _click(driver, add_button)
 
     next_step_button = second_step_form.find_element(By.CLASS_NAME, "btn-next-step")
 
-    logger.info(f"next step button discovered: {next_step_button.text}")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"next step button discovered: {next_step_button.text}")
 
-    WebDriverWait(driver, 10).until(
-        expected_conditions.element_to_be_clickable(next_step_button)
-    ).click()
+    _click(driver, next_step_button)
 
 
 def make_third_step(driver: WebDriver, logger: Logger) -> bool:
@@ -190,55 +346,23 @@ def make_third_step(driver: WebDriver, logger: Logger) -> bool:
 
     logger.info(f"prefer_dates: {prefer_dates}")
 
-    calendar = WebDriverWait(driver, 10).until(
+    calendar = _wait(driver).until(
         expected_conditions.presence_of_element_located((By.ID, "calendar-daygrid"))
     )
 
-    logger.info(f"calendar discovered: {calendar.get_attribute('id')}")
-
-    next_month_button = driver.find_element(By.CLASS_NAME, "calendar-next")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"calendar discovered: {calendar.get_attribute('id')}")
 
-    logger.info(
-        f"next month button discovered: {next_month_button.get_attribute('aria-label')}"
-    )
-
-    WebDriverWait(calendar, 10).until(
+    _wait(calendar).until(
         expected_conditions.presence_of_element_located((By.CLASS_NAME, "cal-today"))
     )
 
-    calendar_rows = calendar.find_elements(By.TAG_NAME, "tr")
-
-    chosen_date = find_date_in_rows(calendar_rows, prefer_dates, logger)
-
-    if chosen_date is None:
-        logger.info("Available date is not found on first page, trying next page")
-
-        WebDriverWait(driver, 10).until(
-            expected_conditions.element_to_be_clickable(next_month_button)
-        ).click()
-
-        WebDriverWait(calendar, 10).until_not(
-            expected_conditions.presence_of_element_located(
-                (By.CLASS_NAME, "cal-today")
-            )
-        )
-
-        next_calendar = WebDriverWait(driver, 10).until(
-            expected_conditions.presence_of_element_located((By.ID, "calendar-daygrid"))
-        )
-
-        logger.info(f"Calendar discovered: {next_calendar.get_attribute('id')}")
-
-        next_calendar_rows = next_calendar.find_elements(By.TAG_NAME, "tr")
-
-        chosen_date = find_date_in_rows(next_calendar_rows, prefer_dates, logger)
+    chosen_date = find_date_in_calendar(driver, prefer_dates, logger)
 
     if chosen_date is not None:
         logger.info("Available date was found!")
 
-        WebDriverWait(driver, 10).until(
-            expected_conditions.element_to_be_clickable(chosen_date)
-        ).click()
+        _click(driver, chosen_date)
 
         # Select preferred time (after 12:00 if available, otherwise earlier)
         try:
@@ -247,18 +371,16 @@ def make_third_step(driver: WebDriver, logger: Logger) -> bool:
             # If time select is not found / not ready, continue with default time
             logger.warning(f"Could not select time automatically: {e}")
 
-        step_3_next = WebDriverWait(driver, 10).until(
+        step_3_next = _wait(driver).until(
             expected_conditions.visibility_of_element_located((By.ID, "step3-next-btn"))
         )
         step_3_next_btn = step_3_next.find_element(By.CLASS_NAME, "btn-next-step")
 
         make_screenshot(driver, logger, "Time selected")
 
-        WebDriverWait(driver, 10).until(
-            expected_conditions.element_to_be_clickable(step_3_next_btn)
-        ).click()
+        _click(driver, step_3_next_btn)
 
-        WebDriverWait(driver, 10).until(
+        _wait(driver).until(
             expected_conditions.invisibility_of_element(step_3_next_btn)
         )
 
@@ -272,13 +394,14 @@ def make_third_step(driver: WebDriver, logger: Logger) -> bool:
 def make_fourth_step(driver: WebDriver, logger: Logger) -> RunOutcome:
     logger.info("Starting fourth step")
 
-    final_form = WebDriverWait(driver, 10).until(
+    final_form = _wait(driver).until(
         expected_conditions.presence_of_element_located((By.ID, "mfa-form4"))
     )
-    logger.info(f"Fourth step form found: {final_form.get_attribute('id')}")
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(f"Fourth step form found: {final_form.get_attribute('id')}")
 
     make_screenshot(driver, logger, caption="Step 4 ready for manual submit")
-    asyncio.run(
+    run_notification(
         notify_bot_with_message(
             "Date and time were selected successfully.\n\n"
             "Chrome is now open on step 4. The bot did not touch the final form. "
@@ -298,7 +421,7 @@ def choose_time_after_noon(driver: WebDriver, logger: Logger, min_hour: int = 12
         option_els = sel_el.find_elements(By.TAG_NAME, "option")
         parsed = []
 
-        asyncio.run(
+        run_notification(
             notify_bot_with_message(
                 f"Found {len(option_els)} options in time select", logger
             )
@@ -313,7 +436,7 @@ def choose_time_after_noon(driver: WebDriver, logger: Logger, min_hour: int = 12
             minute = int(m.group(2))
             parsed.append((hour, minute, text))
 
-        asyncio.run(notify_bot_with_message(f"Parsed {parsed}", logger))
+        run_notification(notify_bot_with_message(f"Parsed {parsed}", logger))
 
         return parsed
 
@@ -344,7 +467,7 @@ def choose_time_after_noon(driver: WebDriver, logger: Logger, min_hour: int = 12
 
         return None, None
 
-    sel, parsed = WebDriverWait(driver, 15).until(lambda d: locate_time_select(d))
+    sel, parsed = _wait(driver, 15).until(lambda d: locate_time_select(d))
 
     if sel is None or parsed is None:
         return
@@ -369,117 +492,139 @@ def get_prefer_dates():
     if dates_range is None:
         raise ValueError("Dates range is None")
 
+    return _parse_prefer_dates(dates_range)
+
+
+# Keyed on the raw value, so a changed PREFER_DATES is still picked up
+@cache
+def _parse_prefer_dates(dates_range: str) -> tuple[date, date]:
     date_strings = dates_range.split(",")
 
     return date.fromisoformat(date_strings[0]), date.fromisoformat(date_strings[1])
 
 
 def make_screenshot(driver: WebDriver, logger: Logger, caption: str | None = None):
-    screenshot = driver.get_screenshot_as_png()
-    html = driver.page_source.encode("utf-8")
+    # JPEG straight from CDP is several times smaller than the WebDriver PNG,
+    # both over the chromedriver channel and for the Telegram upload
+    screenshot = base64.b64decode(
+        driver.execute_cdp_cmd(
+            "Page.captureScreenshot", {"format": "jpeg", "quality": 70}
+        )["data"]
+    )
+    # Page HTML compresses roughly tenfold, and it is only read when debugging
+    html = gzip.compress(driver.page_source.encode("utf-8"), compresslevel=6)
 
-    asyncio.run(notify_bot_with_screenshot(screenshot, logger, html, caption))
+    run_notification(notify_bot_with_screenshot(screenshot, logger, html, caption))
 
 
-async def notify_bot_with_screenshot(
-    screenshot: bytes,
-    logger: Logger,
-    additional_file: bytes | None = None,
-    caption: str | None = None,
-):
-    import telegram
+def run_notification(coroutine: Coroutine[Any, Any, None]):
+    # Every notification runs on one long-lived loop so the cached Bot keeps
+    # its HTTP connection pool between messages
+    asyncio.run_coroutine_threadsafe(coroutine, _get_notification_loop()).result()
 
-    bot_cred = os.environ.get("EMBASSY_BOT")
-    bot_user_id = os.environ.get("BOT_USER_ID")
 
-    if bot_cred is None:
-        logger.error("Bot credentials is None")
-        return
+def _get_notification_loop() -> asyncio.AbstractEventLoop:
+    global _notification_loop
 
-    if bot_user_id is None:
-        logger.error("Bot user ID is None")
-        return
+    with _notification_loop_lock:
+        if _notification_loop is None:
+            loop = asyncio.new_event_loop()
+            Thread(target=loop.run_forever, daemon=True, name="notifications").start()
+            _notification_loop = loop
 
-    bot = telegram.Bot(bot_cred)
-    await bot.send_photo(
-        chat_id=bot_user_id,
-        photo=screenshot,
-        caption=caption or f"screen_{datetime.now()}",
-    )
-    if additional_file:
-        await bot.send_document(
-            chat_id=bot_user_id, document=additional_file, filename="pagehtml.html"
-        )
+        return _notification_loop
 
 
-async def notify_bot_with_message(message: str, logger: Logger):
+def _get_bot(token: str) -> telegram.Bot:
+    # Only called from coroutines on the notification loop, so no lock needed
     import telegram
 
+    bot = _bots.get(token)
+    if bot is None:
+        bot = _bots[token] = telegram.Bot(token)
+    return bot
+
+
+def _get_recipient(logger: Logger) -> tuple[telegram.Bot, str] | None:
     bot_cred = os.environ.get("EMBASSY_BOT")
     bot_user_id = os.environ.get("BOT_USER_ID")
 
     if bot_cred is None:
         logger.error("Bot credentials is None")
-        return
+        return None
 
     if bot_user_id is None:
         logger.error("Bot user ID is None")
-        return
+        return None
 
-    bot = telegram.Bot(bot_cred)
-    await bot.send_message(chat_id=bot_user_id, text=message)
-
-
-def find_date_in_rows(
-    rows: list[WebElement], prefer_dates: tuple[date, date], logger: Logger
-) -> WebElement | None:
-    chosen_date: WebElement | None = None
-    available_dates = set()
-
-    logger.info(f"Rows count is {len(rows)}")
-
-    for row in rows:
-        cols = row.find_elements(By.TAG_NAME, "td")
-
-        logger.info(f"Cols count is {len(cols)}")
+    return _get_bot(bot_cred), bot_user_id
 
-        for col in cols:
-            col_class = col.get_attribute("class")
-            col_date = col.get_attribute("data-date")
 
-            logger.info(f"Class of a col is {col_class}")
+async def notify_bot_with_screenshot(
+    screenshot: bytes,
+    logger: Logger,
+    additional_file: bytes | None = None,
+    caption: str | None = None,
+):
+    recipient = _get_recipient(logger)
+    if recipient is None:
+        return
 
-            if col_date is None or col_date == "":
-                logger.error("ColDate is None or empty")
-                continue
+    bot, bot_user_id = recipient
+    uploads = [
+        bot.send_photo(
+            chat_id=bot_user_id,
+            photo=screenshot,
+            caption=caption or f"screen_{datetime.now()}",
+        )
+    ]
+    if additional_file:
+        uploads.append(
+            bot.send_document(
+                chat_id=bot_user_id,
+                document=additional_file,
+                filename="pagehtml.html.gz",
+            )
+        )
+    await asyncio.gather(*uploads)
 
-            current_date = datetime.strptime(col_date, "%Y-%m-%d").date()
 
-            logger.info(f"Date of a col is {current_date}")
+async def notify_bot_with_message(message: str, logger: Logger):
+    recipient = _get_recipient(logger)
+    if recipient is None:
+        return
 
-            if current_date < prefer_dates[0]:
-                logger.info(f"Date {current_date} is less than {prefer_dates[0]}")
+    bot, bot_user_id = recipient
+    await bot.send_message(chat_id=bot_user_id, text=message)
 
-            if current_date > prefer_dates[1]:
-                logger.info(f"Date {current_date} is greater than {prefer_dates[1]}")
 
-            if col_class is not None and "cal-active" in col_class:
-                available_dates.add(current_date)
+def find_date_in_calendar(
+    driver: WebDriver,
+    prefer_dates: tuple[date, date],
+    logger: Logger,
+    max_months: int = 2,
+) -> WebElement | None:
+    result = driver.execute_async_script(
+        _FIND_DATE_SCRIPT,
+        prefer_dates[0].isoformat(),
+        prefer_dates[1].isoformat(),
+        max_months,
+    )
 
-                logger.info(f"Available date of a col is {current_date}")
+    logger.info(f"Calendar pages searched: {result['months']}")
 
-                if current_date >= prefer_dates[0] and current_date <= prefer_dates[1]:
-                    logger.info(f"Date was found - {col_date}")
-                    chosen_date = col
+    if result["timedOut"]:
+        raise TimeoutException("Calendar did not switch to the next month")
 
-                    break
+    chosen_date: WebElement | None = result["chosen"]
+    available_dates = {date.fromisoformat(col_date) for col_date in result["available"]}
 
-        if chosen_date is not None:
-            break
+    if chosen_date is not None:
+        logger.info(f"Date was found - {result['chosenDate']}")
 
     if len(available_dates) > 0:
         logger.info(f"Available was - {available_dates}")
-        asyncio.run(
+        run_notification(
             notify_bot_with_message(f"Available was - {available_dates}", logger)
         )
 
@@ -494,7 +639,7 @@ def job_func(logger: Logger, driver: WebDriver):
         logger.info("Run outcome: %s", outcome.value)
         return outcome
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e, exc_info=True)
         return RunOutcome.FAILED
     finally:
         logger.info("Quit")
@@ -4,30 +4,23 @@ from threading import Event, Thread
 
 import schedule
 
-import load_env
+from bootstrap import bootstrap
 from bot_control import TelegramControlServer
 from runtime_state import RuntimeStateStore, default_state_path
 from scheduler_controller import SchedulerController
 
-load_env.load()
-
-
-def configure_logging():
-    logging.basicConfig(
-        level=logging.DEBUG if os.getenv("LOG_LEVEL") == "DEBUG" else logging.INFO,
-        format="\n%(name)s → %(levelname)s: %(message)s\n",
-    )
+bootstrap()
 
 
 def run_scheduler(stop_event: Event):
     while not stop_event.is_set():
         schedule.run_pending()
-        stop_event.wait(1)
+        # Sleep until the next job is due; stop_event still wakes us on shutdown
+        idle_seconds = schedule.idle_seconds()
+        stop_event.wait(1 if idle_seconds is None else max(0, idle_seconds))
 
 
 def main():
-    configure_logging()
-
     schedule_logger = logging.getLogger("schedule")
     state_store = RuntimeStateStore(
         os.getenv("BOT_STATE_PATH", default_state_path()),
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from threading import Lock, Thread
 from typing import Callable
@@ -55,6 +54,14 @@ class SchedulerController:
             )
             return False
 
+        # A single browser session can't run two jobs at once; queueing another
+        # worker behind driver_lock only piles up threads when a run outlasts
+        # the scheduler period
+        with self.thread_lock:
+            if self.active_threads:
+                self.logger.info("Skipping scheduled run because a run is in progress")
+                return False
+
         self.init_shared_driver()
         if self.shared_driver is None:
             return False
@@ -113,9 +120,9 @@ class SchedulerController:
             logger.info("Bot auto-disabled because step 4 is waiting for manual submit")
 
             try:
-                from job import notify_bot_with_message
+                from job import notify_bot_with_message, run_notification
 
-                asyncio.run(
+                run_notification(
                     notify_bot_with_message(
                         "Step 4 is ready for manual completion. Bot paused automatically.\n\n"
                         "Use the visible Chrome window to finish the last form. "
@@ -132,9 +139,9 @@ class SchedulerController:
         logger.info("Bot auto-disabled after successful fourth-step approval")
 
         try:
-            from job import notify_bot_with_message
+            from job import notify_bot_with_message, run_notification
 
-            asyncio.run(
+            run_notification(
                 notify_bot_with_message(
                     "Fourth step approval succeeded. Bot disabled automatically.\n\n"
                     f"Updated at: {state.updated_at}",
@@ -5,22 +5,25 @@ from src.chrome_with_cleanup import ChromeWithFullCleanup
 
 
 class FakeSwitchTo:
-    def __init__(self):
+    def __init__(self, driver):
+        self.driver = driver
         self.window_calls = []
 
     def window(self, handle):
         self.window_calls.append(handle)
+        self.driver.current_window_handle = handle
 
 
 class FakeDriver:
-    def __init__(self):
+    def __init__(self, window_handles=None):
         self.current_window_handle = "original"
-        self.window_handles = ["original", "job"]
-        self.switch_to = FakeSwitchTo()
+        self.window_handles = window_handles or ["original", "job"]
+        self.switch_to = FakeSwitchTo(self)
         self.close_called = 0
 
     def close(self):
         self.close_called += 1
+        self.window_handles.remove(self.current_window_handle)
 
 
 class ChromeWithCleanupTests(unittest.TestCase):
@@ -30,12 +33,24 @@ class ChromeWithCleanupTests(unittest.TestCase):
     def test_exit_closes_current_window_by_default(self):
         driver = FakeDriver()
         cleanup = ChromeWithFullCleanup(self.logger, driver)
+        driver.current_window_handle = "job"
 
         cleanup.__exit__(None, None, None)
 
         self.assertEqual(driver.close_called, 1)
         self.assertEqual(driver.switch_to.window_calls, ["original"])
 
+    def test_exit_closes_stray_windows(self):
+        driver = FakeDriver(["original", "job", "popup"])
+        cleanup = ChromeWithFullCleanup(self.logger, driver)
+        driver.current_window_handle = "job"
+
+        cleanup.__exit__(None, None, None)
+
+        self.assertEqual(driver.close_called, 2)
+        self.assertEqual(driver.window_handles, ["original"])
+        self.assertEqual(driver.switch_to.window_calls, ["popup", "original"])
+
     def test_exit_keeps_current_window_open_when_requested(self):
         driver = FakeDriver()
         cleanup = ChromeWithFullCleanup(self.logger, driver)
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import os
+import unittest
+from unittest.mock import patch
+
+from src.job import _get_bot, notify_bot_with_screenshot, run_notification
+
+
+class _FakeBot:
+    def __init__(self):
+        self.events = []
+
+    async def _send(self, name):
+        self.events.append(f"{name} start")
+        await asyncio.sleep(0)
+        self.events.append(f"{name} end")
+
+    async def send_photo(self, **kwargs):
+        await self._send("photo")
+
+    async def send_document(self, **kwargs):
+        await self._send("document")
+
+
+class NotificationTests(unittest.TestCase):
+    def test_run_notification_reuses_one_loop_and_bot(self):
+        seen = []
+
+        async def capture():
+            seen.append((asyncio.get_running_loop(), _get_bot("123:token")))
+
+        run_notification(capture())
+        run_notification(capture())
+
+        self.assertEqual(len(seen), 2)
+        self.assertIs(seen[0][0], seen[1][0])
+        self.assertIs(seen[0][1], seen[1][1])
+
+    def test_run_notification_propagates_errors(self):
+        async def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            run_notification(fail())
+
+    def test_notify_bot_with_screenshot_sends_uploads_concurrently(self):
+        bot = _FakeBot()
+        env = {"EMBASSY_BOT": "123:token", "BOT_USER_ID": "42"}
+
+        with patch.dict(os.environ, env), patch("src.job._get_bot", return_value=bot):
+            run_notification(
+                notify_bot_with_screenshot(
+                    b"jpeg", logging.getLogger("test.notifications"), b"<html>"
+                )
+            )
+
+        self.assertEqual(
+            bot.events,
+            ["photo start", "document start", "photo end", "document end"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import logging
 import os
 import tempfile
 import unittest
+from threading import Event
 
 from src.run_outcome import RunOutcome
 from src.runtime_state import RuntimeStateStore
@@ -49,6 +50,42 @@ class SchedulerControllerTests(unittest.TestCase):
         self.assertFalse(started)
         self.assertEqual(driver_created["count"], 0)
 
+    def test_scheduled_run_is_skipped_while_previous_run_is_active(self):
+        release_run = Event()
+        run_started = Event()
+        runs = []
+
+        def job_runner(logger, driver):
+            del logger, driver
+            runs.append(1)
+            run_started.set()
+            release_run.wait(5)
+            return RunOutcome.NO_SLOT
+
+        controller = SchedulerController(
+            state_store=self.store,
+            logger=self.logger,
+            driver_factory=lambda headless=True: FakeDriver(),
+            job_runner=job_runner,
+        )
+
+        self.assertTrue(controller.start_run_process())
+        self.assertTrue(run_started.wait(5))
+        self.assertFalse(controller.start_run_process())
+
+        release_run.set()
+        with controller.thread_lock:
+            threads = list(controller.active_threads.values())
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(runs), 1)
+        self.assertTrue(controller.start_run_process())
+        with controller.thread_lock:
+            threads = list(controller.active_threads.values())
+        for thread in threads:
+            thread.join(5)
+
     def test_approved_outcome_auto_disables_bot(self):
         controller = SchedulerController(
             state_store=self.store,
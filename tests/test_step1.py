@@ -0,0 +1,75 @@
+import logging
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import NoSuchElementException
+
+from src.job import make_first_step
+
+
+def fake_wait(*args, **kwargs):
+    del args, kwargs
+
+    class _Wait:
+        def until(self, condition):
+            del condition
+            return MagicMock()
+
+    return _Wait()
+
+
+class Step1Tests(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("test.step1")
+        self.original_form_data = os.environ.get("USER_FORM_DATA")
+        os.environ["USER_FORM_DATA"] = "Ivan,Petrov,ivan@example.com,+70000000000"
+
+    def tearDown(self):
+        if self.original_form_data is None:
+            os.environ.pop("USER_FORM_DATA", None)
+        else:
+            os.environ["USER_FORM_DATA"] = self.original_form_data
+
+    def test_make_first_step_inserts_each_value_as_one_input_event(self):
+        driver = MagicMock()
+        inputs = [object() for _ in range(5)]
+        submit_button = object()
+        driver.execute_script.side_effect = [inputs + [submit_button]] + [None] * 7
+
+        with patch("src.job.WebDriverWait", side_effect=fake_wait):
+            make_first_step(driver, self.logger)
+
+        focused = [call.args[1] for call in driver.execute_script.call_args_list[1:6]]
+        self.assertEqual(focused, inputs)
+        self.assertEqual(
+            [call.args for call in driver.execute_cdp_cmd.call_args_list],
+            [
+                ("Input.insertText", {"text": "Ivan"}),
+                ("Input.insertText", {"text": "Petrov"}),
+                ("Input.insertText", {"text": "ivan@example.com"}),
+                ("Input.insertText", {"text": "ivan@example.com"}),
+                ("Input.insertText", {"text": "+70000000000"}),
+            ],
+        )
+        blur_call = driver.execute_script.call_args_list[6]
+        self.assertIn("blur", blur_call.args[0])
+        self.assertIs(blur_call.args[1], inputs[-1])
+        click_call = driver.execute_script.call_args_list[7]
+        self.assertIs(click_call.args[1], submit_button)
+
+    def test_make_first_step_reports_missing_elements(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = [object()] * 4 + [None, None]
+
+        with patch("src.job.WebDriverWait", side_effect=fake_wait):
+            with self.assertRaises(NoSuchElementException) as context:
+                make_first_step(driver, self.logger)
+
+        self.assertIn("phone", str(context.exception))
+        self.assertIn("step1-next-btn button", str(context.exception))
+        self.assertEqual(driver.execute_script.call_args.args[3], "step1-next-btn")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import logging
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import TimeoutException
+
+from src.job import find_date_in_calendar
+
+
+class Step3Tests(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("test.step3")
+        self.prefer_dates = (date(2025, 5, 1), date(2025, 5, 10))
+
+    def test_find_date_in_calendar_returns_chosen_cell(self):
+        driver = MagicMock()
+        cell = object()
+        driver.execute_async_script.return_value = {
+            "chosen": cell,
+            "chosenDate": "2025-05-03",
+            "available": ["2025-04-28", "2025-05-03"],
+            "months": 2,
+            "timedOut": False,
+        }
+
+        with patch("src.job.run_notification") as run_mock, patch(
+            "src.job.notify_bot_with_message", new=MagicMock(return_value=None)
+        ) as notify_mock:
+            chosen = find_date_in_calendar(driver, self.prefer_dates, self.logger)
+
+        self.assertIs(chosen, cell)
+        driver.execute_async_script.assert_called_once()
+        self.assertEqual(
+            driver.execute_async_script.call_args.args[1:],
+            ("2025-05-01", "2025-05-10", 2),
+        )
+        run_mock.assert_called_once()
+        self.assertIn("2025, 4, 28", notify_mock.call_args.args[0])
+
+    def test_find_date_in_calendar_without_active_cells_skips_notification(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = {
+            "chosen": None,
+            "chosenDate": None,
+            "available": [],
+            "months": 2,
+            "timedOut": False,
+        }
+
+        with patch("src.job.run_notification") as run_mock:
+            chosen = find_date_in_calendar(driver, self.prefer_dates, self.logger)
+
+        self.assertIsNone(chosen)
+        run_mock.assert_not_called()
+
+    def test_find_date_in_calendar_raises_when_next_month_never_renders(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = {
+            "chosen": None,
+            "chosenDate": None,
+            "available": [],
+            "months": 1,
+            "timedOut": True,
+        }
+
+        with self.assertRaises(TimeoutException):
+            find_date_in_calendar(driver, self.prefer_dates, self.logger)
+
+
+if __name__ == "__main__":
+    unittest.main()
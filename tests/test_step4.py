@@ -34,7 +34,7 @@ class Step4Tests(unittest.TestCase):
 
         with patch("src.job.WebDriverWait", side_effect=fake_wait), patch(
             "src.job.make_screenshot"
-        ) as screenshot_mock, patch("src.job.asyncio.run") as run_mock, patch(
+        ) as screenshot_mock, patch("src.job.run_notification") as run_mock, patch(
             "src.job.notify_bot_with_message", new=MagicMock(return_value=None)
         ) as notify_mock:
             outcome = make_fourth_step(driver, self.logger)
@@ -74,6 +74,29 @@ class Step4Tests(unittest.TestCase):
         self.assertEqual(outcome, RunOutcome.AWAITING_MANUAL_SUBMIT)
         self.assertTrue(cleanup_instance.keep_current_window)
 
+    def test_process_blocks_trackers_in_the_new_tab(self):
+        driver = MagicMock()
+        cleanup_instance = MagicMock()
+        cleanup_instance.__enter__.return_value = driver
+        cleanup_instance.__exit__.return_value = None
+
+        with patch("src.job.ChromeWithFullCleanup", return_value=cleanup_instance), patch(
+            "src.job.make_first_step"
+        ), patch("src.job.make_second_step"), patch(
+            "src.job.make_third_step", return_value=False
+        ):
+            process(self.logger, driver)
+
+        calls = [(name, args[0]) for name, args, _ in driver.mock_calls if args]
+        new_tab = calls.index(("switch_to.new_window", "tab"))
+        self.assertEqual(
+            calls[new_tab + 1 : new_tab + 3],
+            [
+                ("execute_cdp_cmd", "Network.enable"),
+                ("execute_cdp_cmd", "Network.setBlockedURLs"),
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()